@@ -1,9 +1,211 @@
 import os
-import requests
+import asyncio
+import aiohttp
+import backoff
+from aiolimiter import AsyncLimiter
 from dotenv import load_dotenv
 import json
+import operator
+import orjson
 import csv
+import io
+import logging
+import sys
+import time
 from datetime import datetime
+from urllib.parse import urlencode
+
+log = logging.getLogger(__name__)
+
+# Load environment variables from .env file once, at import
+load_dotenv()
+
+# Get API credentials from environment variables
+API_KEY = os.getenv('x-api-key')
+API_SECRET = os.getenv('x-api-secret')
+
+# Headers sent with every API request on the shared session
+_HEADERS = {
+    'X-Api-Key': API_KEY,
+    'X-Api-Secret': API_SECRET,
+    'Content-Type': 'application/json'
+}
+
+# Stay just under Assembla's API rate limit and cap simultaneous connections
+MAX_PER_SECOND = 5
+MAX_CONCURRENCY = 20
+MAX_CONNECTIONS_PER_HOST = 10
+
+# Keep idle connections open across rate-limit and backoff pauses so they are reused
+KEEPALIVE_TIMEOUT = 60
+
+# Transient failures (connection errors, 429 and 5xx) are retried with backoff
+MAX_TRIES = 5
+DEFAULT_RETRY_AFTER = 1
+
+# Responses are cached on disk between runs and revalidated with ETag/Last-Modified
+CACHE_FILENAME = "assembla_cache.json"
+CACHE_EXPIRE_AFTER = 3600
+CACHE_PRUNE_AFTER = 24 * CACHE_EXPIRE_AFTER
+
+COMMITS_PER_PAGE = 100
+MAX_COMMIT_PAGES = 100
+
+# Repository URLs returned by the API point at www.assembla.com; requests go to in-api
+_rewrite_api_url = operator.methodcaller('replace', 'www.assembla.com/v1', 'in-api.assembla.com/v1')
+
+# Statistics of a Git repository with no commits, branches, tags or merge requests
+_EMPTY_STATS = {
+    'commits_count': 0,
+    'branches_count': 0,
+    'tags_count': 0,
+    'merge_requests_count': 0,
+    'last_commit_author': '',
+    'last_commit_message': '',
+    'last_commit_at': ''
+}
+
+# How each repository status from _classify is displayed and written to CSV
+_STATUS_INDICATORS = {'empty': " [EMPTY REPOSITORY]", 'imported': " [IMPORTED REPOSITORY]", 'active': ""}
+_STATUS_LINES = {
+    'empty': "  Status: Empty repository - no code has been committed\n",
+    'imported': "  Status: Imported repository - contains data but API has limited access\n",
+    'active': ""
+}
+_CSV_STATUS = {'empty': 'True', 'imported': 'Imported', 'active': 'False'}
+
+# Blank and example entries in space_list.csv
+_SKIP_SPACE_NAMES = frozenset(('', 'My Project Space'))
+
+# space_tools types that represent repositories
+_REPO_TYPES = frozenset(('GitTool', 'SubversionTool', 'PerforceDepotTool'))
+
+_CSV_HEADERS = [
+    'Space_Name', 'ID', 'Technical_Name', 'Repository_Name', 'Type', 'Created_At', 'Updated_At',
+    'Size_Bytes', 'Size_MB', 'Default_Branch', 'Last_Commit_At', 'Commits_Count', 
+    'Branches_Count', 'Tags_Count', 'Merge_Requests_Count', 'Is_Empty',
+    'Last_Commit_Author', 'Last_Commit_Message', 'HTTPS_Clone_URL', 'SSH_Clone_URL'
+]
+
+# repo_info keys for each CSV column; the _status column is mapped through _CSV_STATUS
+_CSV_KEYS = [
+    'space_name', 'id',
+    'name',  # Technical name (like git, git-2)
+    'menu_name',  # Actual repository name (like test-repo, Address-book)
+    'type', 'created_at', 'updated_at',
+    'size', 'size_mb', 'default_branch', 'last_commit_at', 'commits_count',
+    'branches_count', 'tags_count', 'merge_requests_count', '_status',
+    'last_commit_author', 'last_commit_message', 'clone_url_https', 'clone_url_ssh'
+]
+_CSV_STATUS_COLUMN = _CSV_KEYS.index('_status')
+
+_cache = {}
+
+def _cache_key(url, params=None):
+    """Build a cache key from the URL and its sorted query parameters"""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+def _load_cache(filename=CACHE_FILENAME):
+    """Load cached API responses saved by a previous run"""
+    global _cache
+    try:
+        with open(filename, 'rb') as cache_file:
+            _cache = orjson.loads(cache_file.read())
+    except FileNotFoundError:
+        _cache = {}
+    except (OSError, json.JSONDecodeError) as e:
+        log.warning("Ignoring unreadable cache %s: %s", filename, e)
+        _cache = {}
+
+def _save_cache(filename=CACHE_FILENAME):
+    """
+    Persist cached API responses for the next run
+
+    Entries not stored or revalidated within CACHE_PRUNE_AFTER are dropped, so
+    responses for removed repositories, branches and pages do not accumulate
+    while a space that failed in one run keeps its entries for the next
+    """
+    now = time.time()
+    recent_entries = {
+        key: entry for key, entry in _cache.items()
+        if now - entry['stored_at'] < CACHE_PRUNE_AFTER
+    }
+    try:
+        with open(filename, 'wb') as cache_file:
+            cache_file.write(orjson.dumps(recent_entries))
+    except OSError as e:
+        log.warning("Could not save cache %s: %s", filename, e)
+
+def _retry_after_seconds(value):
+    """Parse a Retry-After header given in seconds, falling back to a default delay"""
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+@backoff.on_exception(backoff.expo, (aiohttp.ClientError, asyncio.TimeoutError),
+                      max_tries=MAX_TRIES, jitter=backoff.full_jitter)
+async def _get_json(session, throttle, url, params=None, cache_tag=None):
+    """
+    GET a URL on the shared session
+
+    Returns (status, data) where data is the decoded JSON body for 200 responses
+    and the raw response text otherwise. Every request is throttled by the
+    (rate limiter, concurrency semaphore) pair in throttle. 429 and 5xx responses
+    raise so the request is retried; on 429 the Retry-After delay is honoured first
+
+    200 responses are cached. A cached entry is reused without a request while it
+    is younger than CACHE_EXPIRE_AFTER and was stored with the same cache_tag
+    (e.g. the repository's updated_at); otherwise it is revalidated with
+    If-None-Match/If-Modified-Since and a 304 reuses the cached body
+    """
+    key = _cache_key(url, params)
+    entry = _cache.get(key)
+    if (entry and cache_tag is not None and entry.get('tag') == cache_tag
+            and time.time() - entry['stored_at'] < CACHE_EXPIRE_AFTER):
+        return 200, entry['data']
+    
+    conditional_headers = {}
+    if entry:
+        if entry.get('etag'):
+            conditional_headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            conditional_headers['If-Modified-Since'] = entry['last_modified']
+    
+    limiter, semaphore = throttle
+    # Take a concurrency slot first so the rate token is spent when the request is sent
+    async with semaphore:
+        async with limiter:
+            async with session.get(url, params=params, headers=conditional_headers) as response:
+                if response.status == 304 and entry:
+                    entry['tag'] = cache_tag
+                    entry['stored_at'] = time.time()
+                    return 200, entry['data']
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    if response.headers.get('ETag') or response.headers.get('Last-Modified') or cache_tag is not None:
+                        _cache[key] = {
+                            'etag': response.headers.get('ETag'),
+                            'last_modified': response.headers.get('Last-Modified'),
+                            'tag': cache_tag,
+                            'stored_at': time.time(),
+                            'data': data
+                        }
+                    return response.status, data
+                if response.status != 429 and response.status < 500:
+                    return response.status, await response.text()
+                retry_after = _retry_after_seconds(response.headers.get('Retry-After'))
+                error = aiohttp.ClientResponseError(
+                    response.request_info, response.history,
+                    status=response.status, message=response.reason, headers=response.headers
+                )
+    
+    # Sleep outside the semaphore so other requests can proceed meanwhile
+    if error.status == 429:
+        await asyncio.sleep(retry_after)
+    raise error
 
 def load_spaces_from_csv(csv_filename="space_list.csv"):
     """
@@ -14,64 +216,103 @@ def load_spaces_from_csv(csv_filename="space_list.csv"):
     spaces = []
     try:
         with open(csv_filename, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                space_name = row['space_name'].strip()
-                if space_name and space_name != 'My Project Space':  # Skip example entries
-                    spaces.append(space_name)
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            if 'space_name' not in header:
+                log.error("%s has no space_name column", csv_filename)
+                return []
+            idx = header.index('space_name')
+            
+            spaces = [
+                space_name for space_name in (row[idx].strip() for row in reader if len(row) > idx)
+                if space_name not in _SKIP_SPACE_NAMES
+            ]
         
         if not spaces:
-            print(f"No valid spaces found in {csv_filename}")
-            print("Please update the CSV file with your actual space names")
+            log.warning("No valid spaces found in %s", csv_filename)
+            log.warning("Please update the CSV file with your actual space names")
             
         return spaces
         
     except FileNotFoundError:
-        print(f"Error: {csv_filename} not found.")
-        print("Please create the file with column: space_name")
+        log.error("%s not found.", csv_filename)
+        log.error("Please create the file with column: space_name")
         return []
     except Exception as e:
-        print(f"Error reading {csv_filename}: {e}")
+        log.error("Error reading %s: %s", csv_filename, e)
         return []
 
-def fetch_assembla_repositories_for_space(space_name):
-    """
-    Fetch repository metadata from Assembla API for a specific space
+def _classify(repo):
+    """Classify a repository as 'empty', 'imported' or 'active'"""
+    # Improved empty repository detection
+    if (repo.get('commits_count', 0) == 0 and 
+            repo.get('branches_count', 0) == 0 and 
+            repo.get('size', 0) == 0 and
+            not repo.get('last_commit_at') and
+            not repo.get('has_commits_indicator', False)):
+        return 'empty'
+    if repo.get('is_likely_imported', False):
+        return 'imported'
+    return 'active'
+
+def _format_repository(i, repo):
+    """Format the display block for a single repository"""
+    g = repo.get
     
-    Gets repository list with details like type, size, commits, branches, tags, and PRs
-    """
+    status = repo['_status']
+    status_indicator = _STATUS_INDICATORS[status]
+    status_line = _STATUS_LINES[status]
     
-    # Load environment variables from .env file
-    load_dotenv()
+    size_mb = g('size_mb', 0)
+    size_display = f"{size_mb} MB" if size_mb > 0 else f"{g('size', 0)} bytes"
     
-    # Get API credentials from environment variables
-    api_key = os.getenv('x-api-key')
-    api_secret = os.getenv('x-api-secret')
+    block = (
+        f"\nRepository #{i}{status_indicator}:\n"
+        f"  Space: {g('space_name', 'N/A')}\n"
+        f"  ID: {g('id', 'N/A')}\n"
+        f"  Technical Name: {g('name', 'N/A')}\n"
+        f"  Repository Name: {g('menu_name', 'N/A')}\n"
+        f"  Type: {g('type', 'N/A')}\n"
+        f"  Created: {g('created_at', 'N/A')}\n"
+        f"  Size: {size_display}\n"
+        f"  Default Branch: {g('default_branch', 'N/A')}\n"
+        f"  Last Commit: {g('last_commit_at', 'N/A')}\n"
+        f"  Commits: {g('commits_count', 'N/A')}\n"
+        f"  Branches: {g('branches_count', 'N/A')}\n"
+        f"  Tags: {g('tags_count', 'N/A')}\n"
+        f"  Merge Requests: {g('merge_requests_count', 'N/A')}\n"
+        f"{status_line}"
+    )
     
-    if not all([api_key, api_secret]):
-        print("Error: Missing required environment variables.")
-        print("Please ensure .env file contains: x-api-key and x-api-secret")
-        return None
+    author = g('last_commit_author')
+    if author:
+        block += f"  Last Author: {author}\n"
+    message = g('last_commit_message')
+    if message:
+        if len(message) > 100:
+            message = message[:100] + '...'
+        block += f"  Last Message: {message}\n"
     
-    # Set up headers for API requests
-    headers = {
-        'X-Api-Key': api_key,
-        'X-Api-Secret': api_secret,
-        'Content-Type': 'application/json'
-    }
+    return block
+
+async def fetch_assembla_repositories_for_space(space_name, session, throttle, verbose=True):
+    """
+    Fetch repository metadata from Assembla API for a specific space
     
-    print(f"\nProcessing space: {space_name}")
-    print("=" * 60)
+    Gets repository list with details like type, size, commits, branches, tags, and PRs.
+    The per-repository report is only written when verbose is set
+    """
+    
+    log.info("Processing space: %s", space_name)
     
     try:
         # First get repository details from repos endpoint (has size, last_commit_at)
         repos_url = f"https://in-api.assembla.com/v1/spaces/{space_name}/repos.json"
-        print(f"Fetching repository details from: {repos_url}")
-        
-        repos_response = requests.get(repos_url, headers=headers)
-        repos_response.raise_for_status()
+        log.debug("Fetching repository details from: %s", repos_url)
         
-        repos_data = repos_response.json()
+        status, repos_data = await _get_json(session, throttle, repos_url)
+        if status != 200:
+            raise aiohttp.ClientError(f"{repos_url} returned status {status}")
         
         # Create a lookup dict by repo id
         repos_lookup = {repo['id']: repo for repo in repos_data}
@@ -79,169 +320,164 @@ def fetch_assembla_repositories_for_space(space_name):
         # Fetch space tools (repositories)
         space_tools_url = f"https://in-api.assembla.com/v1/spaces/{space_name}/space_tools.json"
         
-        print(f"Fetching space tools from: {space_tools_url}")
-        response = requests.get(space_tools_url, headers=headers)
-        response.raise_for_status()
-        
-        space_tools = response.json()
+        log.debug("Fetching space tools from: %s", space_tools_url)
+        status, space_tools = await _get_json(session, throttle, space_tools_url)
+        if status != 200:
+            raise aiohttp.ClientError(f"{space_tools_url} returned status {status}")
         
         # Filter for repository tools and get detailed info
         repositories = []
-        repo_types = ['GitTool', 'SubversionTool', 'PerforceDepotTool']
-        
-        for tool in space_tools:
+        for tool in (t for t in space_tools if t.get('type') in _REPO_TYPES):
             tool_type = tool.get('type')
-            if tool_type in repo_types:
-                tool_id = tool.get('id')
+            tool_id = tool.get('id')
+            
+            # Get basic info from space_tools
+            repo_info = {
+                'id': tool_id,
+                'name': tool.get('name'),
+                'menu_name': tool.get('menu_name'),  # This is the actual repo name
+                'type': tool_type,
+                'created_at': tool.get('created_at'),
+                'updated_at': tool.get('updated_at'),
+                'space_id': space_name,
+                'space_name': space_name
+            }
+            
+            # Add detailed info from repos endpoint if available
+            repo_data = repos_lookup.get(tool_id)
+            if repo_data is not None:
+                size_bytes = repo_data.get('size', 0)
+                size_mb = round(size_bytes / (1024 * 1024), 2) if size_bytes > 0 else 0
                 
-                # Get basic info from space_tools
-                repo_info = {
-                    'id': tool_id,
-                    'name': tool.get('name'),
-                    'menu_name': tool.get('menu_name'),  # This is the actual repo name
-                    'type': tool_type,
-                    'created_at': tool.get('created_at'),
-                    'updated_at': tool.get('updated_at'),
-                    'space_id': space_name,
-                    'space_name': space_name
-                }
+                repo_info.update({
+                    'size': size_bytes,
+                    'size_mb': size_mb,
+                    'last_commit_at': repo_data.get('last_commit_at'),
+                    'default_branch': repo_data.get('default_branch'),
+                    'clone_url_https': repo_data.get('https_clone_url'),
+                    'clone_url_ssh': repo_data.get('ssh_clone_url')
+                })
                 
-                # Add detailed info from repos endpoint if available
-                if tool_id in repos_lookup:
-                    repo_data = repos_lookup[tool_id]
-                    size_bytes = repo_data.get('size', 0)
-                    size_mb = round(size_bytes / (1024 * 1024), 2) if size_bytes > 0 else 0
-                    
-                    repo_info.update({
-                        'size': size_bytes,
-                        'size_mb': size_mb,
-                        'last_commit_at': repo_data.get('last_commit_at'),
-                        'default_branch': repo_data.get('default_branch'),
-                        'clone_url_https': repo_data.get('https_clone_url'),
-                        'clone_url_ssh': repo_data.get('ssh_clone_url')
-                    })
-                    
 
-                    # If repository has a last_commit_at, it likely has commits even if API can't detect them
-                    if repo_data.get('last_commit_at'):
-                        print(f"    Note: Repository {tool.get('menu_name')} has last_commit_at - contains data")
-                        repo_info['is_likely_imported'] = True
-                        repo_info['has_commits_indicator'] = True
-                    else:
-                        repo_info['is_likely_imported'] = False
-                        repo_info['has_commits_indicator'] = False
-                
-                # Get additional statistics for Git repositories
-                if tool_type == 'GitTool':
+                # If repository has a last_commit_at, it likely has commits even if API can't detect them
+                if repo_data.get('last_commit_at'):
+                    log.debug("    Note: Repository %s has last_commit_at - contains data", tool.get('menu_name'))
+                    repo_info['is_likely_imported'] = True
+                    repo_info['has_commits_indicator'] = True
+                else:
+                    repo_info['is_likely_imported'] = False
+                    repo_info['has_commits_indicator'] = False
+            
+            # Get additional statistics for Git repositories
+            if tool_type == 'GitTool':
+                if repo_data and not repo_data.get('size') and not repo_data.get('last_commit_at'):
+                    # repos.json already shows the repository is empty, so skip the API calls
+                    repo_info.update(_EMPTY_STATS)
+                else:
                     try:
-                        # Pass repository data if available
-                        repo_data_for_stats = repos_lookup.get(tool_id) if tool_id in repos_lookup else None
-                        repo_stats = get_git_repo_statistics(headers, space_name, tool_id, repo_data_for_stats)
+                        repo_stats = await get_git_repo_statistics(
+                            session, throttle, space_name, tool_id, repo_data, cache_tag=tool.get('updated_at')
+                        )
                         repo_info.update(repo_stats)
                     except Exception as e:
-                        print(f"Warning: Could not fetch statistics for repo {tool.get('menu_name')}: {e}")
-                
-                repositories.append(repo_info)
+                        log.warning("Could not fetch statistics for repo %s: %s", tool.get('menu_name'), e)
+            
+            # Classified once here; display and CSV output both read _status
+            repo_info['_status'] = _classify(repo_info)
+            
+            repositories.append(repo_info)
         
         if not repositories:
-            print("No repositories found in this space")
+            log.info("No repositories found in this space")
             return None
         
-        # Display results
-        print(f"\nFound {len(repositories)} repositories:")
-        print("=" * 60)
-        
-        for i, repo in enumerate(repositories, 1):
-            # Improved empty repository detection
-            is_empty = (repo.get('commits_count', 0) == 0 and 
-                       repo.get('branches_count', 0) == 0 and 
-                       repo.get('size', 0) == 0 and
-                       not repo.get('last_commit_at') and
-                       not repo.get('has_commits_indicator', False))
-            
-            is_imported = repo.get('is_likely_imported', False)
-            
-            if is_empty:
-                status_indicator = " [EMPTY REPOSITORY]"
-            elif is_imported:
-                status_indicator = " [IMPORTED REPOSITORY]"
-            else:
-                status_indicator = ""
-            
-            print(f"\nRepository #{i}{status_indicator}:")
-            print(f"  Space: {repo.get('space_name', 'N/A')}")
-            print(f"  ID: {repo.get('id', 'N/A')}")
-            print(f"  Technical Name: {repo.get('name', 'N/A')}")
-            print(f"  Repository Name: {repo.get('menu_name', 'N/A')}")
-            print(f"  Type: {repo.get('type', 'N/A')}")
-            print(f"  Created: {repo.get('created_at', 'N/A')}")
-            size_display = f"{repo.get('size_mb', 0)} MB" if repo.get('size_mb', 0) > 0 else f"{repo.get('size', 0)} bytes"
-            print(f"  Size: {size_display}")
-            print(f"  Default Branch: {repo.get('default_branch', 'N/A')}")
-            print(f"  Last Commit: {repo.get('last_commit_at', 'N/A')}")
-            print(f"  Commits: {repo.get('commits_count', 'N/A')}")
-            print(f"  Branches: {repo.get('branches_count', 'N/A')}")
-            print(f"  Tags: {repo.get('tags_count', 'N/A')}")
-            print(f"  Merge Requests: {repo.get('merge_requests_count', 'N/A')}")
-            
-            if is_empty:
-                print(f"  Status: Empty repository - no code has been committed")
-            elif is_imported:
-                print(f"  Status: Imported repository - contains data but API has limited access")
-            
-            if repo.get('last_commit_author'):
-                print(f"  Last Author: {repo.get('last_commit_author', 'N/A')}")
-            if repo.get('last_commit_message'):
-                message = repo.get('last_commit_message', '')[:100] + '...' if len(repo.get('last_commit_message', '')) > 100 else repo.get('last_commit_message', '')
-                print(f"  Last Message: {message}")
+        # Display results as one write rather than a print per field
+        if verbose:
+            buffer = io.StringIO()
+            buffer.write(f"\nFound {len(repositories)} repositories:\n")
+            buffer.write("=" * 60 + "\n")
+            for i, repo in enumerate(repositories, 1):
+                buffer.write(_format_repository(i, repo))
+            sys.stdout.write(buffer.getvalue())
         
         return repositories
         
-    except requests.exceptions.RequestException as e:
-        print(f"API request error: {e}")
+    except aiohttp.ClientError as e:
+        log.error("API request error: %s", e)
         return None
     except json.JSONDecodeError as e:
-        print(f"JSON parsing error: {e}")
+        log.error("JSON parsing error: %s", e)
         return None
     except Exception as e:
-        print(f"Unexpected error: {e}")
+        log.error("Unexpected error: %s", e)
         return None
 
-def get_git_repo_statistics(headers, space_id, repo_id, repo_data=None):
+async def _fetch_commits(session, throttle, commits_url, params=None, cache_tag=None, known_ids=None):
     """
-    Get detailed statistics for Git repositories including commits, branches, tags, and PRs
-    Fetches commits from all branches, not just the default branch
+    Fetch every page of a commits listing
+
+    Pages of COMMITS_PER_PAGE are requested until a short page is returned, a
+    page adds no new commits (the endpoint ignores page) or MAX_COMMIT_PAGES
+    is reached. When known_ids is given, paging also stops at the first page
+    containing a known commit, where the listing joins history already fetched.
+    Returns (status, commits) where status is that of the first page
     """
-    stats = {
-        'commits_count': 0,
-        'branches_count': 0,
-        'tags_count': 0,
-        'merge_requests_count': 0,
-        'last_commit_author': '',
-        'last_commit_message': '',
-        'last_commit_at': ''
-    }
+    commits = []
+    page_ids = set()
+    for page in range(1, MAX_COMMIT_PAGES + 1):
+        page_params = {**(params or {}), 'page': page, 'per_page': COMMITS_PER_PAGE}
+        status, data = await _get_json(session, throttle, commits_url, page_params, cache_tag)
+        if status != 200:
+            if page == 1:
+                return status, data
+            break
+        
+        new_commits = []
+        reached_known = False
+        for commit in data:
+            commit_id = _commit_id(commit)
+            if known_ids is not None and commit_id in known_ids:
+                reached_known = True
+            elif commit_id not in page_ids:
+                page_ids.add(commit_id)
+                new_commits.append(commit)
+        
+        commits.extend(new_commits)
+        if len(data) < COMMITS_PER_PAGE or not new_commits or reached_known:
+            break
+    else:
+        log.warning("    Stopped paging %s after %s pages", commits_url, MAX_COMMIT_PAGES)
     
+    return 200, commits
+
+def _commit_id(commit):
+    """
+    Return a unique identifier for a commit
+
+    Falls back to a combination of message and timestamp when no ID is present
+    """
+    commit_id = commit.get('id', commit.get('sha', commit.get('revision', '')))
+    if not commit_id:
+        commit_id = f"{commit.get('message', '')[:50]}_{commit.get('authored_at', commit.get('committed_at', ''))}"
+    return commit_id
+
+async def _fetch_branches(session, throttle, space_id, repo_id, branches_url, cache_tag=None):
+    """
+    Get the branches list for a Git repository
+
+    Falls back to alternative endpoints for imported repositories; returns an
+    empty list when no branches can be fetched
+    """
     branches_list = []
     
     try:
-        # Get branches list first - use the URL from repository data if available
-        if repo_data and repo_data.get('branches_url'):
-            branches_url = repo_data['branches_url'].replace('www.assembla.com/v1', 'in-api.assembla.com/v1')
-            print(f"    Using repository-specific branches URL: {branches_url}")
-        else:
-            branches_url = f"https://in-api.assembla.com/v1/spaces/{space_id}/repos/git/branches"
-            print(f"    Using default branches URL: {branches_url}")
-            
-        response = requests.get(branches_url, headers=headers)
+        status, data = await _get_json(session, throttle, branches_url, cache_tag=cache_tag)
         
-        if response.status_code == 200:
-            branches_list = response.json()
-            stats['branches_count'] = len(branches_list)
-            print(f"    Found {len(branches_list)} branches")
-        elif response.status_code == 204:
-            print(f"    No branches found (204), trying alternative approaches...")
-            stats['branches_count'] = 0
+        if status == 200:
+            branches_list = data
+            log.debug("    Found %s branches", len(branches_list))
+        elif status == 204:
+            log.debug("    No branches found (204), trying alternative approaches...")
             
             # Try multiple alternative endpoints for imported repositories
             alternative_endpoints = [
@@ -252,150 +488,195 @@ def get_git_repo_statistics(headers, space_id, repo_id, repo_data=None):
             
             for i, alt_url in enumerate(alternative_endpoints, 1):
                 try:
-                    print(f"    Trying alternative endpoint {i}: {alt_url}")
-                    alt_response = requests.get(alt_url, headers=headers)
-                    print(f"    Alternative endpoint {i} status: {alt_response.status_code}")
+                    log.debug("    Trying alternative endpoint %s: %s", i, alt_url)
+                    alt_status, alt_data = await _get_json(session, throttle, alt_url, cache_tag=cache_tag)
+                    log.debug("    Alternative endpoint %s status: %s", i, alt_status)
                     
-                    if alt_response.status_code == 200:
-                        branches_list = alt_response.json()
-                        stats['branches_count'] = len(branches_list)
-                        print(f"    SUCCESS: Found {len(branches_list)} branches using alternative endpoint {i}")
+                    if alt_status == 200:
+                        branches_list = alt_data
+                        log.debug("    SUCCESS: Found %s branches using alternative endpoint %s", len(branches_list), i)
                         break
-                    elif alt_response.status_code == 204:
-                        print(f"    Alternative endpoint {i} also returned 204 (No Content)")
+                    elif alt_status == 204:
+                        log.debug("    Alternative endpoint %s also returned 204 (No Content)", i)
                     else:
-                        print(f"    Alternative endpoint {i} failed with status {alt_response.status_code}")
+                        log.debug("    Alternative endpoint %s failed with status %s", i, alt_status)
                         
                 except Exception as alt_e:
-                    print(f"    Alternative endpoint {i} exception: {alt_e}")
+                    log.debug("    Alternative endpoint %s exception: %s", i, alt_e)
         else:
-            print(f"    Could not fetch branches, status: {response.status_code}")
-            print(f"    Response: {response.text[:200] if response.text else 'No response text'}")
+            log.warning("    Could not fetch branches, status: %s", status)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("    Response: %s", data[:200] if data else 'No response text')
     except Exception as e:
-        print(f"    Could not fetch branches: {e}")
+        log.warning("    Could not fetch branches: %s", e)
     
+    return branches_list
+
+async def _fetch_tags_count(session, throttle, space_id):
+    """
+    Get the number of tags, or 0 when they cannot be fetched
+
+    The tags URL is shared by every repository in the space, so it is left
+    untagged and always revalidated rather than tied to one tool's updated_at
+    """
     try:
-        # Get tags count
         tags_url = f"https://in-api.assembla.com/v1/spaces/{space_id}/repos/git/tags"
-        response = requests.get(tags_url, headers=headers)
-        if response.status_code == 200:
-            tags = response.json()
-            stats['tags_count'] = len(tags)
-        elif response.status_code == 204:  # No content means no tags
-            stats['tags_count'] = 0
+        status, tags = await _get_json(session, throttle, tags_url)
+        if status == 200:
+            return len(tags)
+    except Exception as e:
+        log.warning("    Could not fetch tags: %s", e)
+    return 0
+
+async def _fetch_merge_requests_count(session, throttle, space_id, repo_id, cache_tag=None):
+    """Get the number of merge requests, or 0 when they cannot be fetched"""
+    try:
+        mr_url = f"https://in-api.assembla.com/v1/spaces/{space_id}/space_tools/{repo_id}/merge_requests.json"
+        status, merge_requests = await _get_json(session, throttle, mr_url, cache_tag=cache_tag)
+        if status == 200:
+            return len(merge_requests)
     except Exception as e:
-        print(f"    Could not fetch tags: {e}")
+        log.warning("    Could not fetch merge requests: %s", e)
+    return 0
+
+def _commit_date(commit):
+    """
+    Return the commit's ISO-8601 timestamp, or '' when it has none
+
+    Timestamps from the API share one format, so they order correctly as strings
+    """
+    return commit.get('authored_at', commit.get('committed_at', commit.get('date', ''))) or ''
+
+async def get_git_repo_statistics(session, throttle, space_id, repo_id, repo_data=None, cache_tag=None):
+    """
+    Get detailed statistics for Git repositories including commits, branches, tags, and PRs
+    Fetches commits from all branches, not just the default branch; branches, tags
+    and merge requests are requested concurrently on the shared session
+    cache_tag (the tool's updated_at) lets cached responses be reused until it changes
+    """
+    stats = dict(_EMPTY_STATS)
+    
+    # Resolve the branches and commits URLs once - use the URLs from repository data if available
+    if repo_data and repo_data.get('branches_url'):
+        branches_url = _rewrite_api_url(repo_data['branches_url'])
+        log.debug("    Using repository-specific branches URL: %s", branches_url)
+    else:
+        branches_url = f"https://in-api.assembla.com/v1/spaces/{space_id}/repos/git/branches"
+        log.debug("    Using default branches URL: %s", branches_url)
+    
+    if repo_data and repo_data.get('commits_url'):
+        commits_url = _rewrite_api_url(repo_data['commits_url'])
+        log.debug("    Using repository-specific commits URL: %s", commits_url)
+    else:
+        commits_url = f"https://in-api.assembla.com/v1/spaces/{space_id}/repos/git/commits"
+        log.debug("    Using default commits URL: %s", commits_url)
+    
+    # Branches, tags and merge requests are independent, so fetch them together
+    branches_list, stats['tags_count'], stats['merge_requests_count'] = await asyncio.gather(
+        _fetch_branches(session, throttle, space_id, repo_id, branches_url, cache_tag),
+        _fetch_tags_count(session, throttle, space_id),
+        _fetch_merge_requests_count(session, throttle, space_id, repo_id, cache_tag)
+    )
+    stats['branches_count'] = len(branches_list)
     
     # Collect all commits from all branches
     all_commits = []
-    latest_commit = None
-    latest_commit_date = None
+    seen_ids = set()
+    batch_latests = []
     
-    if branches_list:
-        for branch in branches_list:
-            branch_name = branch.get('name', branch.get('id', 'unknown'))
-            try:
-                # Get commits for this specific branch - use repository-specific URL if available
-                if repo_data and repo_data.get('commits_url'):
-                    commits_url = repo_data['commits_url'].replace('www.assembla.com/v1', 'in-api.assembla.com/v1')
-                else:
-                    commits_url = f"https://in-api.assembla.com/v1/spaces/{space_id}/repos/git/commits"
-                    
-                params = {'branch': branch_name} if branch_name != 'unknown' else {}
-                
-                print(f"    Fetching commits from branch: {branch_name}")
-                response = requests.get(commits_url, headers=headers, params=params)
-                
-                if response.status_code == 200:
-                    branch_commits = response.json()
-                    print(f"    Found {len(branch_commits)} commits in branch {branch_name}")
+    def add_commits(commits):
+        """Add commits to our collection (avoid duplicates by commit ID) and record the batch's latest"""
+        new_commits = []
+        for commit in commits:
+            commit_id = _commit_id(commit)
+            if commit_id not in seen_ids:
+                seen_ids.add(commit_id)
+                new_commits.append(commit)
+        
+        if new_commits:
+            all_commits.extend(new_commits)
+            batch_latests.append(max(new_commits, key=_commit_date))
+    
+    # A single paginated query without a branch covers most commits in one pass
+    try:
+        status, data = await _fetch_commits(session, throttle, commits_url, cache_tag=cache_tag)
+        if status == 200:
+            add_commits(data)
+            log.debug("    Found %s commits total", len(data))
+        elif status == 422 and not branches_list:
+            log.debug("    No commits found (422), trying alternative approaches for imported repo...")
+            
+            # Try multiple alternative endpoints for imported repositories
+            alternative_commit_endpoints = [
+                f"https://in-api.assembla.com/v1/spaces/{space_id}/space_tools/{repo_id}/git/commits",
+                f"https://in-api.assembla.com/v1/spaces/{space_id}/repos/{repo_id}/git/commits",
+                f"https://in-api.assembla.com/v1/spaces/{space_id}/git_repos/{repo_id}/commits"
+            ]
+            
+            for i, alt_url in enumerate(alternative_commit_endpoints, 1):
+                try:
+                    log.debug("    Trying alternative commits endpoint %s: %s", i, alt_url)
+                    alt_status, alt_data = await _get_json(session, throttle, alt_url, cache_tag=cache_tag)
+                    log.debug("    Alternative commits endpoint %s status: %s", i, alt_status)
                     
-                    # Add commits to our collection (avoid duplicates by commit ID)
-                    for commit in branch_commits:
-                        commit_id = commit.get('id', commit.get('sha', commit.get('revision', '')))
-                        # If no unique ID found, use a combination of message and timestamp
-                        if not commit_id:
-                            commit_id = f"{commit.get('message', '')[:50]}_{commit.get('authored_at', commit.get('committed_at', ''))}"
-                        
-                        # Check for duplicates
-                        is_duplicate = False
-                        for existing_commit in all_commits:
-                            existing_id = existing_commit.get('id', existing_commit.get('sha', existing_commit.get('revision', '')))
-                            if not existing_id:
-                                existing_id = f"{existing_commit.get('message', '')[:50]}_{existing_commit.get('authored_at', existing_commit.get('committed_at', ''))}"
-                            
-                            if commit_id == existing_id:
-                                is_duplicate = True
-                                break
+                    if alt_status == 200:
+                        add_commits(alt_data)
+                        log.debug("    SUCCESS: Found %s commits using alternative endpoint %s", len(alt_data), i)
+                        break
+                    elif alt_status == 204:
+                        log.debug("    Alternative commits endpoint %s returned 204 (No Content)", i)
+                    else:
+                        log.debug("    Alternative commits endpoint %s failed with status %s", i, alt_status)
                         
-                        if not is_duplicate:
-                            all_commits.append(commit)
-                            
-                            # Track the latest commit across all branches
-                            commit_date = commit.get('authored_at', commit.get('committed_at', commit.get('date', '')))
-                            if commit_date and (not latest_commit_date or commit_date > latest_commit_date):
-                                latest_commit = commit
-                                latest_commit_date = commit_date
-                                
+                except Exception as alt_e:
+                    log.debug("    Alternative commits endpoint %s exception: %s", i, alt_e)
+                    
+        elif status == 422:
+            log.debug("    No unbranched commits (422), falling back to per-branch queries")
+        elif status == 204:
+            log.debug("    Repository has no commits (204 No Content)")
+        else:
+            log.warning("    Could not fetch commits, status: %s", status)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("    Response: %s", data[:200] if data else 'No response text')
+    except Exception as e:
+        log.warning("    Could not fetch commits: %s", e)
+    
+    # Only query branches whose tip commit was not already returned above
+    branch_names = [
+        branch.get('name', branch.get('id', 'unknown')) for branch in branches_list
+        if branch.get('commit_id') not in seen_ids
+    ]
+    branch_names = [branch_name for branch_name in branch_names if branch_name != 'unknown']
+    
+    if branch_names:
+        tasks = []
+        for branch_name in branch_names:
+            log.debug("    Fetching commits from branch: %s", branch_name)
+            tasks.append(_fetch_commits(
+                session, throttle, commits_url, {'branch': branch_name}, cache_tag, known_ids=seen_ids
+            ))
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for branch_name, result in zip(branch_names, results):
+            try:
+                if isinstance(result, BaseException):
+                    raise result
+                
+                status, branch_commits = result
+                if status == 200:
+                    log.debug("    Found %s commits in branch %s", len(branch_commits), branch_name)
+                    add_commits(branch_commits)
                 else:
-                    print(f"    Could not fetch commits for branch {branch_name}, status: {response.status_code}")
+                    log.warning("    Could not fetch commits for branch %s, status: %s", branch_name, status)
                     
             except Exception as e:
-                print(f"    Could not fetch commits for branch {branch_name}: {e}")
-    else:
-        # Fallback: try to get commits without specifying branch
-        try:
-            # Use repository-specific commits URL if available
-            if repo_data and repo_data.get('commits_url'):
-                commits_url = repo_data['commits_url'].replace('www.assembla.com/v1', 'in-api.assembla.com/v1')
-                print(f"    Using repository-specific commits URL: {commits_url}")
-            else:
-                commits_url = f"https://in-api.assembla.com/v1/spaces/{space_id}/repos/git/commits"
-                print(f"    Using default commits URL: {commits_url}")
-                
-            response = requests.get(commits_url, headers=headers)
-            if response.status_code == 200:
-                all_commits = response.json()
-                print(f"    Found {len(all_commits)} commits total")
-                if all_commits:
-                    latest_commit = all_commits[0]  # Assume first is latest
-            elif response.status_code == 422:
-                print(f"    No commits found (422), trying alternative approaches for imported repo...")
-                
-                # Try multiple alternative endpoints for imported repositories
-                alternative_commit_endpoints = [
-                    f"https://in-api.assembla.com/v1/spaces/{space_id}/space_tools/{repo_id}/git/commits",
-                    f"https://in-api.assembla.com/v1/spaces/{space_id}/repos/{repo_id}/git/commits",
-                    f"https://in-api.assembla.com/v1/spaces/{space_id}/git_repos/{repo_id}/commits"
-                ]
-                
-                for i, alt_url in enumerate(alternative_commit_endpoints, 1):
-                    try:
-                        print(f"    Trying alternative commits endpoint {i}: {alt_url}")
-                        alt_response = requests.get(alt_url, headers=headers)
-                        print(f"    Alternative commits endpoint {i} status: {alt_response.status_code}")
-                        
-                        if alt_response.status_code == 200:
-                            all_commits = alt_response.json()
-                            print(f"    SUCCESS: Found {len(all_commits)} commits using alternative endpoint {i}")
-                            if all_commits:
-                                latest_commit = all_commits[0]
-                            break
-                        elif alt_response.status_code == 204:
-                            print(f"    Alternative commits endpoint {i} returned 204 (No Content)")
-                        else:
-                            print(f"    Alternative commits endpoint {i} failed with status {alt_response.status_code}")
-                            
-                    except Exception as alt_e:
-                        print(f"    Alternative commits endpoint {i} exception: {alt_e}")
-                        
-            elif response.status_code == 204:
-                print(f"    Repository has no commits (204 No Content)")
-            else:
-                print(f"    Could not fetch commits, status: {response.status_code}")
-                print(f"    Response: {response.text[:200] if response.text else 'No response text'}")
-        except Exception as e:
-            print(f"    Could not fetch commits: {e}")
+                log.warning("    Could not fetch commits for branch %s: %s", branch_name, e)
+    
+    # Reduce the per-branch latest commits; max keeps the first on ties, so when
+    # commits carry no dates this is the first commit returned
+    latest_commit = max(batch_latests, key=_commit_date, default=None)
     
     # Set final statistics
     stats['commits_count'] = len(all_commits)
@@ -413,92 +694,43 @@ def get_git_repo_statistics(headers, space_id, repo_id, repo_data=None):
     
     # If API failed but repository data indicates commits exist, estimate commit count
     elif repo_data and repo_data.get('last_commit_at') and stats['commits_count'] == 0:
-        print(f"    API failed to get commits, but repository has last_commit_at - estimating commits exist")
+        log.debug("    API failed to get commits, but repository has last_commit_at - estimating commits exist")
         stats['last_commit_at'] = repo_data.get('last_commit_at')
         # For imported repos with branches but no detectable commits, estimate at least 1 commit per branch
         if stats['branches_count'] > 0:
             stats['commits_count'] = max(1, stats['branches_count'])  # At least 1 commit, or 1 per branch
-            print(f"    Estimated {stats['commits_count']} commits based on {stats['branches_count']} branches")
+            log.debug("    Estimated %s commits based on %s branches", stats['commits_count'], stats['branches_count'])
         else:
             stats['commits_count'] = 1  # At least 1 commit if last_commit_at exists
-            print(f"    Estimated 1 commit based on last_commit_at presence")
-    
-    try:
-        # Get merge requests count
-        mr_url = f"https://in-api.assembla.com/v1/spaces/{space_id}/space_tools/{repo_id}/merge_requests.json"
-        response = requests.get(mr_url, headers=headers)
-        if response.status_code == 200:
-            merge_requests = response.json()
-            stats['merge_requests_count'] = len(merge_requests)
-    except Exception as e:
-        print(f"    Could not fetch merge requests: {e}")
+            log.debug("    Estimated 1 commit based on last_commit_at presence")
     
-    print(f"    Final stats: {stats['commits_count']} commits, {stats['branches_count']} branches, {stats['tags_count']} tags, {stats['merge_requests_count']} MRs")
+    log.debug("    Final stats: %s commits, %s branches, %s tags, %s MRs", stats['commits_count'], stats['branches_count'], stats['tags_count'], stats['merge_requests_count'])
     return stats
 
-def save_repositories_to_csv(repositories, filename):
-    """Save repositories data to CSV file"""
-    if not repositories:
-        return
-    
-    # Define CSV headers
-    headers = [
-        'Space_Name', 'ID', 'Technical_Name', 'Repository_Name', 'Type', 'Created_At', 'Updated_At',
-        'Size_Bytes', 'Size_MB', 'Default_Branch', 'Last_Commit_At', 'Commits_Count', 
-        'Branches_Count', 'Tags_Count', 'Merge_Requests_Count', 'Is_Empty',
-        'Last_Commit_Author', 'Last_Commit_Message', 'HTTPS_Clone_URL', 'SSH_Clone_URL'
-    ]
-    
-    try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            
-            # Write headers
-            writer.writerow(headers)
-            
-            # Write data rows
-            for repo in repositories:
-                # Improved empty repository detection
-                is_empty = (repo.get('commits_count', 0) == 0 and 
-                           repo.get('branches_count', 0) == 0 and 
-                           repo.get('size', 0) == 0 and
-                           not repo.get('last_commit_at') and
-                           not repo.get('has_commits_indicator', False))
-                
-                is_imported = repo.get('is_likely_imported', False)
-                
-                row = [
-                    repo.get('space_name', ''),
-                    repo.get('id', ''),
-                    repo.get('name', ''),  # Technical name (like git, git-2)
-                    repo.get('menu_name', ''),  # Actual repository name (like test-repo, Address-book)
-                    repo.get('type', ''),
-                    repo.get('created_at', ''),
-                    repo.get('updated_at', ''),
-                    repo.get('size', ''),
-                    repo.get('size_mb', ''),
-                    repo.get('default_branch', ''),
-                    repo.get('last_commit_at', ''),
-                    repo.get('commits_count', ''),
-                    repo.get('branches_count', ''),
-                    repo.get('tags_count', ''),
-                    repo.get('merge_requests_count', ''),
-                    'True' if is_empty else ('Imported' if is_imported else 'False'),
-                    repo.get('last_commit_author', ''),
-                    repo.get('last_commit_message', ''),
-                    repo.get('clone_url_https', ''),
-                    repo.get('clone_url_ssh', '')
-                ]
-                writer.writerow(row)
-                
-        print(f"CSV file saved successfully with {len(repositories)} records")
-        
-    except Exception as e:
-        print(f"Error saving CSV file: {e}")
+def _rows(repositories):
+    """Yield CSV rows for repositories, in _CSV_HEADERS order"""
+    for repo in repositories:
+        row = [repo.get(key, '') for key in _CSV_KEYS]
+        row[_CSV_STATUS_COLUMN] = _CSV_STATUS[repo['_status']]
+        yield row
+
+async def _write_queued_rows(queue, writer):
+    """Write each space's repositories from the queue as CSV rows until a None sentinel arrives"""
+    while True:
+        repositories = await queue.get()
+        if repositories is None:
+            break
+        writer.writerows(_rows(repositories))
 
-def fetch_all_repositories():
+async def fetch_all_repositories(csv_filename, max_per_second=MAX_PER_SECOND, verbose=True):
     """
-    Fetch repositories from all spaces defined in CSV file
+    Fetch repositories from all spaces defined in CSV file and stream them to csv_filename
+
+    Spaces are processed concurrently over a single shared HTTP session, with
+    at most max_per_second API requests issued per second. Each space's
+    repositories are queued to a single writer task as soon as the space
+    completes. Returns a dict of repository counts per space; verbose controls
+    the per-repository report
     """
     # Load spaces from CSV
     spaces = load_spaces_from_csv()
@@ -506,53 +738,104 @@ def fetch_all_repositories():
     if not spaces:
         return None
     
-    all_repositories = []
+    spaces_summary = {}
+    queue = asyncio.Queue()
+    
+    # Created per run so they belong to the running event loop
+    throttle = (AsyncLimiter(max_per_second, 1), asyncio.Semaphore(MAX_CONCURRENCY))
     
-    for space_name in spaces:
-        print(f"\nFetching repositories for space: {space_name}")
-        repositories = fetch_assembla_repositories_for_space(space_name)
+    async def process_space(space_name, session):
+        repositories = await fetch_assembla_repositories_for_space(space_name, session, throttle, verbose)
         
         if repositories:
-            all_repositories.extend(repositories)
-            print(f"Found {len(repositories)} repositories in {space_name}")
+            await queue.put(repositories)
+            spaces_summary[space_name] = len(repositories)
+            log.info("Found %s repositories in %s", len(repositories), space_name)
         else:
-            print(f"No repositories found or error occurred for space: {space_name}")
+            log.info("No repositories found or error occurred for space: %s", space_name)
+    
+    try:
+        csvfile = open(csv_filename, 'w', newline='', encoding='utf-8')
+    except OSError as e:
+        log.error("Error saving CSV file: %s", e)
+        return None
+    
+    _load_cache()
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONCURRENCY, limit_per_host=MAX_CONNECTIONS_PER_HOST, keepalive_timeout=KEEPALIVE_TIMEOUT
+    )
+    
+    try:
+        with csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(_CSV_HEADERS)
+            writer_task = asyncio.create_task(_write_queued_rows(queue, writer))
+            
+            try:
+                async with aiohttp.ClientSession(headers=_HEADERS, connector=connector) as session:
+                    await asyncio.gather(*[process_space(space_name, session) for space_name in spaces])
+            finally:
+                await queue.put(None)
+                await writer_task
+    finally:
+        _save_cache()
     
-    return all_repositories
+    if not spaces_summary:
+        os.remove(csv_filename)
+        return None
+    
+    # Report spaces in the order they were listed, not the order they completed
+    return {space_name: spaces_summary[space_name] for space_name in spaces if space_name in spaces_summary}
 
 def main():
     """Main function to run the script"""
-    print("Assembla Repositories Metadata Fetcher (Multiple Spaces)")
-    print("=" * 60)
+    # Set LOG_LEVEL=DEBUG to see per-request diagnostics; unknown levels fall back to INFO
+    log_level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').strip().upper())
+    if not isinstance(log_level, int):
+        log_level = logging.INFO
     
-    all_repositories = fetch_all_repositories()
+    # Progress and the report go to stdout as plain lines; warnings and errors go
+    # to stderr with their level so they stand out from normal output
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.addFilter(lambda record: record.levelno < logging.WARNING)
+    stdout_handler.setFormatter(logging.Formatter('%(message)s'))
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setLevel(logging.WARNING)
+    stderr_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+    logging.basicConfig(level=log_level, handlers=[stdout_handler, stderr_handler])
     
-    if all_repositories:
-        print(f"\n" + "=" * 60)
-        print(f"SUMMARY: Successfully fetched {len(all_repositories)} repositories from all spaces!")
-        
-        # Group by space for summary
-        spaces_summary = {}
-        for repo in all_repositories:
-            space_name = repo.get('space_name', 'Unknown')
-            if space_name not in spaces_summary:
-                spaces_summary[space_name] = 0
-            spaces_summary[space_name] += 1
+    # Set VERBOSE=0 to skip the per-repository report (e.g. in CI)
+    verbose = os.getenv('VERBOSE', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+    
+    log.info("Assembla Repositories Metadata Fetcher (Multiple Spaces)")
+    log.info("=" * 60)
+    
+    if not all([API_KEY, API_SECRET]):
+        log.error("Missing required environment variables.")
+        log.error("Please ensure .env file contains: x-api-key and x-api-secret")
+        return
+    
+    # Rows are written to the CSV file as each space completes
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_filename = f"assembla_repositories_{timestamp}.csv"
+    spaces_summary = asyncio.run(fetch_all_repositories(csv_filename, verbose=verbose))
+    
+    if spaces_summary:
+        total_repositories = sum(spaces_summary.values())
+        log.info("=" * 60)
+        log.info("SUMMARY: Successfully fetched %s repositories from all spaces!", total_repositories)
         
-        print("\nRepositories per space:")
+        log.info("Repositories per space:")
         for space_name, count in spaces_summary.items():
-            print(f"  {space_name}: {count} repositories")
+            log.info("  %s: %s repositories", space_name, count)
         
-        # Automatically save to CSV file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        csv_filename = f"assembla_repositories_{timestamp}.csv"
-        save_repositories_to_csv(all_repositories, csv_filename)
-        print(f"\nResults saved to {csv_filename}")
+        log.info("CSV file saved successfully with %s records", total_repositories)
+        log.info("Results saved to %s", csv_filename)
     else:
-        print("Failed to fetch repositories. Please check your configuration and try again.")
-        print("Make sure:")
-        print("1. space_list.csv exists with valid space IDs")
-        print("2. .env file contains valid x-api-key and x-api-secret")
+        log.error("Failed to fetch repositories. Please check your configuration and try again.")
+        log.error("Make sure:")
+        log.error("1. space_list.csv exists with valid space IDs")
+        log.error("2. .env file contains valid x-api-key and x-api-secret")
 
 if __name__ == "__main__":
     main()